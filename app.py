@@ -1,5 +1,6 @@
 import io
 import re
+import csv
 import base64
 import hashlib
 from pathlib import Path
@@ -42,8 +43,13 @@ def _img_to_b64(path: Path) -> str:
     except Exception:
         return ""
 
-LOGO1_B64 = _img_to_b64(LOGO1_PATH)
-LOGO2_B64 = _img_to_b64(LOGO2_PATH)
+@st.cache_resource(show_spinner=False)
+def get_logo_b64(path_str: str) -> str:
+    # Logos don't change while the server runs: read + encode once per process, not per rerun
+    return _img_to_b64(Path(path_str))
+
+LOGO1_B64 = get_logo_b64(str(LOGO1_PATH))
+LOGO2_B64 = get_logo_b64(str(LOGO2_PATH))
 
 def inject_css():
     st.markdown("""
@@ -143,6 +149,8 @@ if "SALT" not in st.secrets or not st.secrets["SALT"]:
     st.stop()
 
 SALT = st.secrets["SALT"]
+# SHA-256 state with the salt already absorbed; hash_id copies it per value
+SALT_HASH = hashlib.sha256(SALT.encode("utf-8"))
 inject_css()
 
 # ---------------------------
@@ -239,140 +247,206 @@ PRESETS = {
     }
 }
 
-WEEKLY_TIME_BANDS = ["<1h", "1–2h", "2–3h", "≥3h", "1-2h", "2-3h", ">=3h"]
 LANG_BANDS = ["Basic/With support", "Working", "Fluent"]
+DECISION_LABELS = ["Priority", "Admit", "Reserve (Equity)", "Reserve"]
 
 # ---------------------------
 # Helpers
 # ---------------------------
-def normalize_email(x):
-    if pd.isna(x):
-        return ""
-    return str(x).strip().lower()
+def normalize_emails(values: pd.Series) -> pd.Series:
+    """Strip and lowercase a whole email column; missing values become ""."""
+    return values.where(values.notna(), "").astype(str).astype(object).str.strip().str.lower()
 
 def hash_id(value: str) -> str:
-    v = (SALT + value).encode("utf-8")
-    return hashlib.sha256(v).hexdigest()[:16]
-
-def org_to_sector(org_text: str) -> str:
-    if not isinstance(org_text, str) or org_text.strip() == "":
-        return "Other/Unclassified"
-    x = org_text.lower()
-    if any(k in x for k in ["universit", "school", "educat"]): return "Education"
-    if any(k in x for k in ["ngo", "foundation", "association", "civil", "non profit", "non-profit"]): return "NGO/CSO"
-    if any(k in x for k in ["ministry", "gov", "municipal", "department of", "bureau"]): return "Government"
-    if any(k in x for k in ["united nations", "world bank", "fao", "ifad", "ifpri", "undp", "unesco"]): return "Multilateral"
-    if any(k in x for k in ["ltd", "company", "bv", "inc", "plc", "gmbh", "sarl"]): return "Private"
-    if any(k in x for k in ["farmer", "coop", "co-op", "cooperative"]): return "Farmer Org"
-    if any(k in x for k in ["consult"]): return "Consultancy"
-    if any(k in x for k in ["bank", "finance", "microfinance"]): return "Finance"
-    return "Other/Unclassified"
-
-def rubric_heuristic_score(text: str, min_words: int, length_targets=(200, 300)):
+    h = SALT_HASH.copy()
+    h.update(value.encode("utf-8"))
+    return h.hexdigest()[:16]
+
+def hash_ids(values: pd.Series) -> pd.Series:
     """
-    ADAPTIVE: Minimum word count now configurable based on preset
+    Column-wise hash_id: each distinct value is hashed once and mapped back,
+    so repeated emails (before dedup) don't pay for SHA-256 again.
+    """
+    digests = {v: hash_id(v) for v in values.unique()}
+    return values.map(digests)
+
+def _keyword_pattern(keywords) -> str:
+    return "|".join(re.escape(k) for k in keywords)
+
+# Keyword groups are joined into regex alternations once at import, so each
+# group is a single C-level scan over the column instead of a Python loop per row.
+SECTOR_PATTERNS = [
+    ("Education", _keyword_pattern(["universit", "school", "educat"])),
+    ("NGO/CSO", _keyword_pattern(["ngo", "foundation", "association", "civil", "non profit", "non-profit"])),
+    ("Government", _keyword_pattern(["ministry", "gov", "municipal", "department of", "bureau"])),
+    ("Multilateral", _keyword_pattern(["united nations", "world bank", "fao", "ifad", "ifpri", "undp", "unesco"])),
+    ("Private", _keyword_pattern(["ltd", "company", "bv", "inc", "plc", "gmbh", "sarl"])),
+    ("Farmer Org", _keyword_pattern(["farmer", "coop", "co-op", "cooperative"])),
+    ("Consultancy", _keyword_pattern(["consult"])),
+    ("Finance", _keyword_pattern(["bank", "finance", "microfinance"])),
+]
+
+MOT_NUMBER_PATTERN = r"\b\d+\b"
+MOT_WHEN_PATTERN = _keyword_pattern(["week", "month", "timeline", "plan", "schedule"])
+MOT_WHERE_PATTERN = _keyword_pattern(["district", "province", "country", "region", "university", "ministry"])
+MOT_DATA_PATTERN = _keyword_pattern(["data", "dataset", "dashboard", "faostat", "survey", "indicator"])
+MOT_ROLE_PATTERN = _keyword_pattern(["lecturer", "extension", "officer", "analyst", "programme", "policy"])
+MOT_PILOT_PATTERN = _keyword_pattern(["pilot", "test"])
+MOT_DURATION_PATTERN = _keyword_pattern(["5–6 weeks", "5-6 weeks"])
+MOT_PEOPLE_PATTERN = _keyword_pattern(["student", "farmer"])
+# Relevance counts distinct keywords, so each one keeps its own pattern
+FS_PATTERNS = [_keyword_pattern([k]) for k in
+               ["food system", "seed", "agric", "market", "value chain", "policy", "extension", "nutrition", "farm"]]
+MOT_SCORE_COLS = ["_mot_specificity", "_mot_feasibility", "_mot_relevance"]
+
+FUNC_FINANCE_PATTERN = _keyword_pattern(["finance", "financial", "accountant", "economist", "banking", "treasury", "audit"])
+FUNC_DIRECT_PATTERN = _keyword_pattern(["lecturer", "extension", "analyst", "programme", "program officer", "policy",
+                                        "teacher", "advisor", "manager", "director"])
+FUNC_INDIRECT_PATTERN = _keyword_pattern(["assistant", "admin", "coordinator", "student", "intern"])
+
+def _text_series(values: pd.Series) -> pd.Series:
     """
-    if not isinstance(text, str) or text.strip() == "":
-        return (0, 0, 0)
+    Stripped text per row; non-string cells (NaN, numbers) become empty strings.
+    Kept as Python str objects: on pandas' Arrow-backed str dtype, .str regexes run
+    in RE2 (ASCII-only digit/word/space classes) and .str.lower() differs from str.lower() for
+    some letters (e.g. İ), which changes matches on non-English answers.
+    """
+    if not (pd.api.types.is_object_dtype(values) or pd.api.types.is_string_dtype(values)):
+        return pd.Series("", index=values.index, dtype=object)
+    return values.astype(object).str.strip().fillna("")
 
-    t = text.strip()
-    words = len(t.split())
+def _contains(text: pd.Series, pattern: str) -> np.ndarray:
+    return text.str.contains(pattern, regex=True).to_numpy(dtype=bool)
 
-    # Configurable minimum
-    if words < min_words:
-        return (0, 0, 0)
+def orgs_to_sectors(org_texts: pd.Series) -> pd.Series:
+    """
+    Infer sector from organisation text for the whole column.
+    First matching sector in SECTOR_PATTERNS order wins, as before.
+    """
+    tl = _text_series(org_texts).str.lower()
+    matches = [_contains(tl, pattern) for _, pattern in SECTOR_PATTERNS]
+    labels = [sector for sector, _ in SECTOR_PATTERNS]
+    return pd.Series(np.select(matches, labels, default="Other/Unclassified"), index=org_texts.index)
 
-    has_numbers = bool(re.search(r"\b\d+\b", t))
-    has_when = any(w in t.lower() for w in ["week", "month", "timeline", "plan", "schedule"])
-    has_where = any(w in t.lower() for w in ["district", "province", "country", "region", "university", "ministry"])
-    has_data = any(w in t.lower() for w in ["data", "dataset", "dashboard", "faostat", "survey", "indicator"])
-    has_role = any(w in t.lower() for w in ["lecturer", "extension", "officer", "analyst", "programme", "policy"])
+def rubric_heuristic_scores(texts: pd.Series, min_words: int, length_targets=(200, 300)) -> pd.DataFrame:
+    """
+    Vectorized over the whole motivation column: one keyword scan per group
+    instead of a Python call per row. Returns specificity / feasibility / relevance.
+    ADAPTIVE: Minimum word count now configurable based on preset
+    """
+    t = _text_series(texts)
+    words = t.str.split().str.len().fillna(0).to_numpy(dtype=np.int64)
+
+    # Empty text and motivations under the configurable minimum score nothing,
+    # so only the remaining rows go through the keyword scans
+    scores = np.zeros((len(t), len(MOT_SCORE_COLS)), dtype=np.int64)
+    eligible = (words > 0) & (words >= min_words)
+    if not eligible.any():
+        return pd.DataFrame(scores, index=texts.index, columns=MOT_SCORE_COLS)
+    t, words = t[eligible], words[eligible]
+    tl = t.str.lower()
+
+    has_numbers = _contains(t, MOT_NUMBER_PATTERN)
+    has_when = _contains(tl, MOT_WHEN_PATTERN)
+    has_where = _contains(tl, MOT_WHERE_PATTERN)
+    has_data = _contains(tl, MOT_DATA_PATTERN)
+    has_role = _contains(tl, MOT_ROLE_PATTERN)
 
     # Specificity
-    spec = 0
-    if words >= length_targets[0]: spec += 4
-    if words >= length_targets[1]: spec += 2
-    if has_where or has_data: spec += 3
-    if has_role: spec += 1
-    spec = min(spec, 10)
+    spec = (
+        4 * (words >= length_targets[0])
+        + 2 * (words >= length_targets[1])
+        + 3 * (has_where | has_data)
+        + 1 * has_role
+    )
 
     # Feasibility
-    feas = 0
-    if has_numbers: feas += 3
-    if has_when: feas += 4
-    if "pilot" in t.lower() or "test" in t.lower(): feas += 2
-    if "5–6 weeks" in t.lower() or "5-6 weeks" in t.lower(): feas += 1
-    feas = min(feas, 10)
+    feas = (
+        3 * has_numbers
+        + 4 * has_when
+        + 2 * _contains(tl, MOT_PILOT_PATTERN)
+        + 1 * _contains(tl, MOT_DURATION_PATTERN)
+    )
 
     # Relevance
-    rel = 0
-    fs_keywords = ["food system", "seed", "agric", "market", "value chain", "policy", "extension", "nutrition", "farm"]
-    keyword_count = sum(1 for k in fs_keywords if k in t.lower())
-    if keyword_count >= 2: rel += 4
-    elif keyword_count >= 1: rel += 2
-    if has_where: rel += 3
-    if has_data: rel += 2
-    if "student" in t.lower() or "farmer" in t.lower(): rel += 1
-    rel = min(rel, 10)
-
-    return (spec, feas, rel)
-
-def label_band(val, admit_thr, priority_thr, sector, equity_reserve, equity_range):
-    if val >= priority_thr:
-        return "Priority"
-    if val >= admit_thr:
-        return "Admit"
-    if equity_reserve and sector == "Farmer Org" and equity_range[0] <= val <= equity_range[1]:
-        return "Reserve (Equity)"
-    return "Reserve"
-
-def normalize_time_value(v):
-    if not isinstance(v, str):
-        return v
-    x = v.strip()
-    x = x.replace("–", "-").replace("—", "-")
-    x = x.replace("≥", ">=")
-    x_compact = re.sub(r"\s+", "", x.lower())
-
-    if x_compact in ["<1h", "<1hour", "<1hrs", "<1hr"]:
-        return "<1h"
-    if x_compact in ["1-2h", "1-2hours", "1-2hrs", "1-2hr"]:
-        return "1-2h"
-    if x_compact in ["2-3h", "2-3hours", "2-3hrs", "2-3hr"]:
-        return "2-3h"
-    if x_compact in [">=3h", ">=3hours", ">=3hrs", ">=3hr"]:
-        return ">=3h"
-    return x
-
-def map_band(val, valid):
-    if not isinstance(val, str):
-        return None
-    v = val.strip()
-    return v if v in valid else None
+    keyword_count = sum(_contains(tl, p).astype(np.int64) for p in FS_PATTERNS)
+    rel = (
+        np.select([keyword_count >= 2, keyword_count >= 1], [4, 2], default=0)
+        + 3 * has_where
+        + 2 * has_data
+        + 1 * _contains(tl, MOT_PEOPLE_PATTERN)
+    )
+
+    scores[eligible] = np.minimum(np.column_stack([spec, feas, rel]), 10)
+    return pd.DataFrame(scores, index=texts.index, columns=MOT_SCORE_COLS)
+
+def label_bands(rfs: pd.Series, sectors: pd.Series, admit_thr, priority_thr, equity_reserve, equity_range) -> np.ndarray:
+    """Decision label per row; np.select keeps the first matching band, like the old if-chain."""
+    val = rfs.to_numpy()
+    is_equity = (
+        bool(equity_reserve)
+        & (sectors.to_numpy() == "Farmer Org")
+        & (val >= equity_range[0]) & (val <= equity_range[1])
+    )
+    return np.select(
+        [val >= priority_thr, val >= admit_thr, is_equity],
+        ["Priority", "Admit", "Reserve (Equity)"],
+        default="Reserve",
+    )
 
-def get_time_points(x):
-    if x in ["≥3h", ">=3h"]: return 10
-    if x in ["2–3h", "2-3h"]: return 6
-    if x in ["1–2h", "1-2h"]: return 3
-    if x == "<1h": return 0
-    return 0
+# Accepted spellings of each weekly time band once dashes/≥ are normalized,
+# text is lowercased and whitespace removed
+TIME_BAND_ALIASES = {
+    alias: band
+    for band, aliases in {
+        "<1h": ["<1h", "<1hour", "<1hrs", "<1hr"],
+        "1-2h": ["1-2h", "1-2hours", "1-2hrs", "1-2hr"],
+        "2-3h": ["2-3h", "2-3hours", "2-3hrs", "2-3hr"],
+        ">=3h": [">=3h", ">=3hours", ">=3hrs", ">=3hr"],
+    }.items()
+    for alias in aliases
+}
+TIME_POINTS = {"<1h": 0, "1-2h": 3, "2-3h": 6, ">=3h": 10}
+
+def normalize_time_bands(values: pd.Series) -> pd.Series:
+    """Canonical weekly time band per row (categorical over TIME_POINTS); NaN when unrecognised."""
+    key = (
+        _text_series(values)
+        .str.replace("–", "-").str.replace("—", "-").str.replace("≥", ">=")
+        .str.lower()
+        .str.replace(r"\s+", "", regex=True)  # Unicode \s: also drops NBSP / narrow NBSP
+    )
+    return key.map(TIME_BAND_ALIASES).astype(pd.CategoricalDtype(list(TIME_POINTS)))
 
-def yes_no_points(x, cap):
-    if pd.isna(x) or x is None:
-        return 0
-    text = str(x).strip().lower()
-    if not text:
-        return 0
+def map_bands(values: pd.Series, valid) -> pd.Series:
+    """Stripped value when it is one of `valid` (categorical over `valid`); NaN otherwise."""
+    v = _text_series(values)
+    return v.where(v.isin(valid)).astype(pd.CategoricalDtype(valid))
 
-    no_prefixes = ["no", "none", "n/a", "na", "not applicable", "0"]
-    if any(text == p or text.startswith(p + " ") or text.startswith(p + ",") for p in no_prefixes):
-        return 0
+# "No"-style answers: the whole answer, or its first word before a space/comma
+NO_ANSWER_PATTERN = r"^(?:no|none|n/a|na|not applicable|0)(?:$|[ ,])"
 
-    yes_prefixes = ["yes", "y", "true", "1", "ja", "oui", "si"]
-    if any(text == p or text.startswith(p + " ") or text.startswith(p + ",") for p in yes_prefixes):
-        return cap
+def yes_no_points(values: pd.Series, cap) -> pd.Series:
+    """
+    Column-wise referee/alumni points: empty or "no"-style answers score 0;
+    explicit yes and any other free text earn the full cap.
+    """
+    # str() keeps numeric 0/1 answers; object dtype matches _text_series' Unicode rules
+    text = values.astype(str).astype(object).str.strip().str.lower()
+    is_no = values.isna().to_numpy() | text.eq("").to_numpy(dtype=bool) | _contains(text, NO_ANSWER_PATTERN)
+    return pd.Series(np.where(is_no, 0, cap), index=values.index)
 
-    return cap
+def function_points(titles: pd.Series, cap, finance_boost: bool = False) -> pd.Series:
+    """
+    Full points for directly relevant roles (and finance roles when finance_boost),
+    half for indirect ones, 0 otherwise.
+    """
+    tl = _text_series(titles).str.lower()
+    full = _contains(tl, FUNC_DIRECT_PATTERN)
+    if finance_boost:
+        full = full | _contains(tl, FUNC_FINANCE_PATTERN)
+    half = _contains(tl, FUNC_INDIRECT_PATTERN)
+    return pd.Series(np.select([full, half], [cap, cap * 0.5], default=0), index=titles.index)
 
 # ---------------------------
 # Sidebar – Configuration
@@ -443,14 +517,15 @@ st.sidebar.caption(f"💡 Using **{preset['name']}** preset")
 # ---------------------------
 # Banner
 # ---------------------------
-logos_html = ""
-if LOGO1_B64:
-    logos_html += f'<img src="data:image/png;base64,{LOGO1_B64}" alt="Logo 1">'
-if LOGO2_B64:
-    logos_html += f'<img src="data:image/png;base64,{LOGO2_B64}" alt="Logo 2">'
-
-st.markdown(
-    f"""
+@st.cache_data(show_spinner=False)
+def banner_html() -> str:
+    logos_html = ""
+    if LOGO1_B64:
+        logos_html += f'<img src="data:image/png;base64,{LOGO1_B64}" alt="Logo 1">'
+    if LOGO2_B64:
+        logos_html += f'<img src="data:image/png;base64,{LOGO2_B64}" alt="Logo 2">'
+
+    return f"""
     <div class="app-banner">
       <div class="app-banner-inner">
         <div class="app-banner-left">
@@ -462,9 +537,9 @@ st.markdown(
         </div>
       </div>
     </div>
-    """,
-    unsafe_allow_html=True
-)
+    """
+
+st.markdown(banner_html(), unsafe_allow_html=True)
 
 # ---------------------------
 # Main
@@ -533,18 +608,49 @@ with st.expander("📄 Expected columns"):
 - **ApplicationDate** (for dedup)
 """)
 
-def read_uploaded_table(uploaded_file) -> pd.DataFrame:
-    name = (uploaded_file.name or "").lower()
+def sniff_delimiter(raw_bytes: bytes, encoding: str, sample_size: int = 65536):
+    """
+    Detect the delimiter from the first complete lines of the file, so the bulk
+    parse can use pandas' C engine. Returns None when sniffing fails.
+    """
+    sample = raw_bytes[:sample_size].decode(encoding, errors="replace")
+    if len(raw_bytes) > sample_size and "\n" in sample:
+        sample = sample[:sample.rfind("\n")]
+    try:
+        return csv.Sniffer().sniff(sample, delimiters=",;\t|").delimiter
+    except csv.Error:
+        return None
 
+@st.cache_data(show_spinner="Parsing upload…")
+def parse_table(raw_bytes: bytes, name: str) -> pd.DataFrame:
+    """Parse upload bytes; cached so widget reruns don't re-read the same file."""
     if name.endswith(".xlsx") or name.endswith(".xls"):
-        return pd.read_excel(uploaded_file, engine="openpyxl")
+        try:
+            # Rust-based reader, much faster than openpyxl on large workbooks (pandas >= 2.2)
+            return pd.read_excel(io.BytesIO(raw_bytes), engine="calamine")
+        except (ImportError, ValueError):
+            return pd.read_excel(io.BytesIO(raw_bytes), engine="openpyxl")
 
-    raw_bytes = uploaded_file.getvalue()
     encodings = ["utf-8", "utf-8-sig", "cp1252", "latin1"]
 
     for enc in encodings:
         try:
-            return pd.read_csv(io.BytesIO(raw_bytes), encoding=enc, sep=None, engine="python")
+            # Validate the encoding up front: pyarrow would return undecodable text as bytes
+            raw_bytes.decode(enc)
+            sep = sniff_delimiter(raw_bytes, enc)
+            parsed = None
+            if sep is not None:
+                try:
+                    parsed = pd.read_csv(io.BytesIO(raw_bytes), encoding=enc, sep=sep, engine="pyarrow")
+                except (ImportError, ValueError, NotImplementedError):
+                    # pyarrow is stricter than the C engine (e.g. ragged rows, invalid bytes);
+                    # its ArrowInvalid parse errors are ValueErrors
+                    parsed = pd.read_csv(io.BytesIO(raw_bytes), encoding=enc, sep=sep)
+            if parsed is None or parsed.shape[1] <= 1:
+                # The sniff only saw the head of the file and may have picked the wrong
+                # separator; let the python engine detect it over the whole file
+                parsed = pd.read_csv(io.BytesIO(raw_bytes), encoding=enc, sep=None, engine="python")
+            return parsed
         except UnicodeDecodeError:
             continue
         except Exception:
@@ -557,6 +663,9 @@ def read_uploaded_table(uploaded_file) -> pd.DataFrame:
     text = raw_bytes.decode("utf-8", errors="replace")
     return pd.read_csv(io.StringIO(text), sep=None, engine="python")
 
+def read_uploaded_table(uploaded_file) -> pd.DataFrame:
+    return parse_table(uploaded_file.getvalue(), (uploaded_file.name or "").lower())
+
 uploaded = st.file_uploader("Upload applications file", type=["csv", "xlsx"])
 if uploaded is None:
     st.info("💡 Select a preset in the sidebar, then upload your file.")
@@ -610,124 +719,127 @@ if lang_col == "— none —" and w_lang > 15:
 # ---------------------------
 # Processing
 # ---------------------------
-work = df.copy()
-
-# Remove PID if exists
-if "PID" in work.columns:
-    work.drop(columns=["PID"], inplace=True)
-
-if email_col != "— none —" and email_col in work.columns:
-    work["_original_email"] = work[email_col].copy()
-    emails_norm = work[email_col].map(normalize_email)
-    work.insert(0, "PID", emails_norm.apply(hash_id))
-    work.drop(columns=[email_col], inplace=True)
-else:
-    work["_original_email"] = None
-    work.insert(0, "PID", [hash_id(f"row_{i}") for i in range(len(work))])
-
-# Deduplicate
-if date_col != "— none —" and date_col in work.columns:
-    work["_app_date"] = pd.to_datetime(work[date_col], errors="coerce")
-    work = work.sort_values("_app_date").drop_duplicates(subset=["PID"], keep="last")
-else:
-    work = work.drop_duplicates(subset=["PID"], keep="first")
-
-# Resolve sector
-if sector_col != "— none —" and sector_col in work.columns:
-    work["_sector"] = work[sector_col].fillna("Other/Unclassified")
-elif org_col != "— none —" and org_col in work.columns:
-    work["_sector"] = work[org_col].apply(org_to_sector)
-else:
-    work["_sector"] = "Other/Unclassified"
-
-# Motivation scores (adaptive minimum)
-if mot_col != "— none —" and mot_col in work.columns:
-    mot_scores = work[mot_col].apply(lambda x: rubric_heuristic_score(x, min_mot_words))
-    work["_mot_specificity"] = mot_scores.apply(lambda t: t[0])
-    work["_mot_feasibility"] = mot_scores.apply(lambda t: t[1])
-    work["_mot_relevance"]   = mot_scores.apply(lambda t: t[2])
-    work["_mot_total"] = work[["_mot_specificity", "_mot_feasibility", "_mot_relevance"]].sum(axis=1)
-else:
-    work["_mot_specificity"] = 0
-    work["_mot_feasibility"] = 0
-    work["_mot_relevance"] = 0
-    work["_mot_total"] = 0
-
-work["_mot_scaled"] = (work["_mot_total"] / 30.0) * w_motivation
-work["_mot_scaled"] = work["_mot_scaled"].clip(lower=0, upper=w_motivation)
-
-# Sector uplift
-def sector_points(s):
-    s_clean = s if s in sector_uplift else "Other/Unclassified"
-    return sector_uplift.get(s_clean, 0)
+@st.cache_data(show_spinner=False)
+def compute_base_features(df, email_col, date_col, sector_col, org_col, mot_col, min_mot_words) -> pd.DataFrame:
+    """
+    Weight-independent part of the pipeline: PIDs, dedup, sector and motivation rubric.
+    Cached on the parsed upload + column mapping, so moving a weight or threshold
+    only recombines these features instead of re-hashing and re-scoring every row.
+    """
+    # Shallow copy: new frame to add/drop columns on without touching the caller's
+    # df or copying its column data
+    work = df.copy(deep=False)
+
+    # Remove PID if exists
+    if "PID" in work.columns:
+        work.drop(columns=["PID"], inplace=True)
+
+    if email_col != "— none —" and email_col in work.columns:
+        work["_original_email"] = work[email_col]
+        emails_norm = normalize_emails(work[email_col])
+        work.insert(0, "PID", hash_ids(emails_norm))
+        work.drop(columns=[email_col], inplace=True)
+    else:
+        work["_original_email"] = None
+        row_keys = pd.Series([f"row_{i}" for i in range(len(work))], index=work.index)
+        work.insert(0, "PID", hash_ids(row_keys))
+
+    # Deduplicate
+    if date_col != "— none —" and date_col in work.columns:
+        work["_app_date"] = pd.to_datetime(work[date_col], errors="coerce")
+        work = work.sort_values("_app_date").drop_duplicates(subset=["PID"], keep="last")
+    else:
+        work = work.drop_duplicates(subset=["PID"], keep="first")
+
+    # Resolve sector
+    if sector_col != "— none —" and sector_col in work.columns:
+        work["_sector"] = work[sector_col].fillna("Other/Unclassified")
+    elif org_col != "— none —" and org_col in work.columns:
+        work["_sector"] = orgs_to_sectors(work[org_col])
+    else:
+        work["_sector"] = "Other/Unclassified"
+    # Handful of distinct values: store as codes so uplift lookup and grouping work on ints
+    work["_sector"] = work["_sector"].astype("category")
+
+    # Motivation scores (adaptive minimum)
+    if mot_col != "— none —" and mot_col in work.columns:
+        # Only the total feeds the RFS, so the three sub-scores aren't kept as columns
+        work["_mot_total"] = rubric_heuristic_scores(work[mot_col], min_mot_words).to_numpy().sum(axis=1)
+    else:
+        work["_mot_total"] = 0
+
+    return work
 
-work["_sector_points"] = work["_sector"].map(sector_points).clip(0, w_sector)
+# ---------------------------
+# Scoring + results
+# ---------------------------
+# Only mapped columns reach the output, so the rest of the upload is dropped before the
+# cached pipeline hashes and copies it (wide survey exports often have 50+ columns)
+mapped_cols = [c for c in dict.fromkeys([
+    email_col, org_col, sector_col, mot_col, func_col, time_col, lang_col, ref_col, alm_col, date_col,
+]) if c != "— none —"]
+work = compute_base_features(df[mapped_cols], email_col, date_col, sector_col, org_col, mot_col, min_mot_words)
+
+# Component points are collected here and attached to work in one assign below
+points = {}
+mot_total = work["_mot_total"].to_numpy(dtype=np.float64)
+points["_mot_scaled"] = np.clip(mot_total / 30.0 * w_motivation, 0, w_motivation)
+
+# Sector uplift: one value per category, gathered by code. Unknown sectors get the
+# Other/Unclassified uplift; the trailing entry also covers code -1 (missing).
+sectors = work["_sector"].cat
+other_uplift = sector_uplift.get("Other/Unclassified", 0)
+uplift = np.array([sector_uplift.get(c, other_uplift) for c in sectors.categories] + [other_uplift])
+points["_sector_points"] = np.clip(uplift[sectors.codes.to_numpy()], 0, w_sector)
 
 # Referee + Alumni
-work["_ref_points"] = (
-    work[ref_col].apply(lambda x: yes_no_points(x, w_referee))
+points["_ref_points"] = (
+    yes_no_points(work[ref_col], w_referee)
     if ref_col != "— none —" and ref_col in work.columns else 0
 )
-work["_alm_points"] = (
-    work[alm_col].apply(lambda x: yes_no_points(x, w_alumni))
+points["_alm_points"] = (
+    yes_no_points(work[alm_col], w_alumni)
     if alm_col != "— none —" and alm_col in work.columns else 0
 )
 
 # Function relevance
-def function_points(x):
-    if not isinstance(x, str):
-        return 0
-    xl = x.lower()
-    # Finance-specific keywords
-    finance_keywords = ["finance", "financial", "accountant", "economist", "banking", "treasury", "audit"]
-    is_finance = any(k in xl for k in finance_keywords)
-    
-    direct = any(k in xl for k in ["lecturer", "extension", "analyst", "programme", "program officer", "policy", "teacher", "advisor", "manager", "director"])
-    indirect = any(k in xl for k in ["assistant", "admin", "coordinator", "student", "intern"])
-    
-    if is_finance and preset_choice == "finance_optimized":
-        return w_function  # Full points for finance roles in finance preset
-    elif direct:
-        return w_function
-    elif indirect:
-        return w_function * 0.5
-    return 0
-
-work["_func_points"] = (
-    work[func_col].apply(function_points)
+points["_func_points"] = (
+    function_points(work[func_col], w_function, finance_boost=preset_choice == "finance_optimized")
     if func_col != "— none —" and func_col in work.columns else 0
 )
 
-# Time & language
-work["_time_band"] = (
-    work[time_col].apply(lambda x: map_band(normalize_time_value(x), WEEKLY_TIME_BANDS))
-    if time_col != "— none —" and time_col in work.columns else None
-)
-work["_lang_band"] = (
-    work[lang_col].apply(lambda x: map_band(x, LANG_BANDS))
-    if lang_col != "— none —" and lang_col in work.columns else None
-)
+# Time & language: bands are categoricals, so points are a gather from a small
+# per-band table by category code (trailing 0 covers code -1, i.e. no valid band)
+if time_col != "— none —" and time_col in work.columns:
+    time_band = normalize_time_bands(work[time_col])
+    time_table = np.array(list(TIME_POINTS.values()) + [0])
+    points["_time_points"] = np.minimum(time_table[time_band.cat.codes.to_numpy()], w_time)
+else:
+    points["_time_points"] = 0
 
-work["_time_points"] = work["_time_band"].apply(get_time_points) if isinstance(work["_time_band"], pd.Series) else 0
-work["_lang_points"] = work["_lang_band"].apply(lambda x: {"Fluent": w_lang, "Working": w_lang*0.6, "Basic/With support": w_lang*0.3}.get(x, 0)) if isinstance(work["_lang_band"], pd.Series) else 0
+if lang_col != "— none —" and lang_col in work.columns:
+    lang_band = map_bands(work[lang_col], LANG_BANDS)
+    lang_points = {"Fluent": w_lang, "Working": w_lang*0.6, "Basic/With support": w_lang*0.3}
+    lang_table = np.array([lang_points[b] for b in LANG_BANDS] + [0])
+    points["_lang_points"] = np.minimum(lang_table[lang_band.cat.codes.to_numpy()], w_lang)
+else:
+    points["_lang_points"] = 0
 
-work["_time_points"] = np.minimum(work["_time_points"], w_time) if isinstance(work["_time_points"], pd.Series) else 0
-work["_lang_points"] = np.minimum(work["_lang_points"], w_lang) if isinstance(work["_lang_points"], pd.Series) else 0
+work = work.assign(**points)
 
 # Final RFS
 rfs_cols = ["_mot_scaled", "_sector_points", "_ref_points", "_func_points", "_time_points", "_lang_points", "_alm_points"]
-work["_RFS"] = work[rfs_cols].sum(axis=1).round(2)
-
-work["_label"] = work.apply(
-    lambda r: label_band(
-        r["_RFS"],
-        thr_admit,
-        thr_priority,
-        r["_sector"],
-        equity_on,
-        (equity_lower, equity_upper),
-    ),
-    axis=1
+# One reduction over a contiguous (components x rows) block instead of a DataFrame projection
+rfs_parts = np.stack([work[c].to_numpy(dtype=np.float64) for c in rfs_cols])
+work["_RFS"] = np.round(rfs_parts.sum(axis=0), 2)
+
+work["_label"] = label_bands(
+    work["_RFS"],
+    work["_sector"],
+    thr_admit,
+    thr_priority,
+    equity_on,
+    (equity_lower, equity_upper),
 )
 
 # Prepare output
@@ -744,6 +856,9 @@ pretty = work[out_cols].rename(columns={
     "_lang_points": "LanguagePts",
     "_alm_points": "AlumniPts"
 })
+# Few distinct values: category codes make the Summary groupby/value_counts integer work
+pretty["Sector"] = pretty["Sector"].astype("category")
+pretty["predicted Decision"] = pd.Categorical(pretty["predicted Decision"], categories=DECISION_LABELS, ordered=True)
 
 # Score distribution stats
 mean_rfs = pretty["RFS"].mean()
@@ -762,7 +877,7 @@ tab_score, tab_summary, tab_presets, tab_about = st.tabs(["📊 Scores", "📈 S
 
 with tab_score:
     st.dataframe(pretty, use_container_width=True)
-    
+
     # Score distribution
     col1, col2, col3, col4 = st.columns(4)
     with col1:
@@ -774,15 +889,15 @@ with tab_score:
     with col4:
         st.metric("75th percentile", f"{q75:.1f}")
 
-    download_df = pretty.copy()
+    # Add Email on a new frame (pretty stays as shown), and let to_csv pick/order columns while writing
+    download_df, download_cols = pretty, list(pretty.columns)
     if "_original_email" in work.columns:
-        download_df.insert(1, "Email", work.loc[pretty.index, "_original_email"].values)
+        download_df = pretty.assign(Email=work.loc[pretty.index, "_original_email"].values)
+        download_cols.insert(1, "Email")
 
-    csv_buf = io.StringIO()
-    download_df.to_csv(csv_buf, index=False)
     st.download_button(
         "⬇️ Download scored CSV (with emails)",
-        data=csv_buf.getvalue(),
+        data=download_df.to_csv(index=False, columns=download_cols),
         file_name=f"rfs_scored_v3_{preset_choice}.csv",
         mime="text/csv"
     )
@@ -803,49 +918,40 @@ with tab_summary:
 
     st.divider()
     st.subheader("By sector")
-    by_sector = pretty.groupby(["Sector", "predicted Decision"]).size().to_frame("N").reset_index()
-    pivot = by_sector.pivot(index="Sector", columns="predicted Decision", values="N").fillna(0).astype(int)
+    pivot = pd.crosstab(pretty["Sector"], pretty["predicted Decision"]).rename_axis(columns=None)
+    # Plain string headers: a CategoricalIndex doesn't survive the Arrow round trip
+    pivot.columns = pivot.columns.astype(str)
     st.dataframe(pivot, use_container_width=True)
-    
+
     st.divider()
     st.subheader("Component breakdown")
-    comp_means = {
-        "Motivation": pretty["MotivationPts"].mean(),
-        "Sector": pretty["SectorPts"].mean(),
-        "Referee": pretty["RefereePts"].mean(),
-        "Function": pretty["FunctionPts"].mean(),
-        "Time": pretty["TimePts"].mean(),
-        "Language": pretty["LanguagePts"].mean(),
-        "Alumni": pretty["AlumniPts"].mean()
-    }
-    
-    comp_df = pd.DataFrame(list(comp_means.items()), columns=["Component", "Mean Points"])
-    comp_df["% of Max"] = [
-        comp_means["Motivation"] / w_motivation * 100 if w_motivation > 0 else 0,
-        comp_means["Sector"] / w_sector * 100 if w_sector > 0 else 0,
-        comp_means["Referee"] / w_referee * 100 if w_referee > 0 else 0,
-        comp_means["Function"] / w_function * 100 if w_function > 0 else 0,
-        comp_means["Time"] / w_time * 100 if w_time > 0 else 0,
-        comp_means["Language"] / w_lang * 100 if w_lang > 0 else 0,
-        comp_means["Alumni"] / w_alumni * 100 if w_alumni > 0 else 0
-    ]
-    comp_df["% of Max"] = comp_df["% of Max"].round(1)
+    # All seven means in one reduction; zero-weight components report 0% of max
+    comp_cols = ["MotivationPts", "SectorPts", "RefereePts", "FunctionPts", "TimePts", "LanguagePts", "AlumniPts"]
+    comp_weights = np.array([w_motivation, w_sector, w_referee, w_function, w_time, w_lang, w_alumni], dtype=np.float64)
+    comp_means = pretty[comp_cols].mean().to_numpy()
+    pct_of_max = np.divide(comp_means, comp_weights, out=np.zeros_like(comp_means), where=comp_weights > 0) * 100
+
+    comp_df = pd.DataFrame({
+        "Component": [c.removesuffix("Pts") for c in comp_cols],
+        "Mean Points": comp_means,
+        "% of Max": pct_of_max.round(1),
+    })
     st.dataframe(comp_df, use_container_width=True)
 
 with tab_presets:
     st.subheader("🎯 Available Presets")
-    
+
     for key, p in PRESETS.items():
         with st.expander(f"{p['name']}" + (" ← Current" if key == preset_choice else "")):
             st.markdown(f"**{p['description']}**")
-            
+
             col1, col2 = st.columns(2)
             with col1:
                 st.markdown("**Thresholds:**")
                 st.markdown(f"- Admit: {p['thresh_admit']}")
                 st.markdown(f"- Priority: {p['thresh_priority']}")
                 st.markdown(f"- Min words: {p['min_motivation_words']}")
-            
+
             with col2:
                 st.markdown("**Weights:**")
                 st.markdown(f"- Motivation: {p['w_motivation']}")
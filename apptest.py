@@ -52,9 +52,11 @@ def ensure_logo(path: Path, url: str):
         # If download fails, UI will still render without that logo.
         pass
 
-def _img_to_b64(path: Path) -> str:
+@st.cache_resource(show_spinner=False)
+def _img_to_b64(path_str: str) -> str:
+    """Read + base64-encode a logo once per process, not on every rerun."""
     try:
-        b = path.read_bytes()
+        b = Path(path_str).read_bytes()
         return base64.b64encode(b).decode("utf-8")
     except Exception:
         return ""
@@ -62,8 +64,8 @@ def _img_to_b64(path: Path) -> str:
 ensure_logo(LOGO1_PATH, LOGO1_URL)
 ensure_logo(LOGO2_PATH, LOGO2_URL)
 
-LOGO1_B64 = _img_to_b64(LOGO1_PATH)
-LOGO2_B64 = _img_to_b64(LOGO2_PATH)
+LOGO1_B64 = _img_to_b64(str(LOGO1_PATH))
+LOGO2_B64 = _img_to_b64(str(LOGO2_PATH))
 
 # ---------------------------
 # CSS injection (solid styling)
@@ -196,6 +198,8 @@ if "SALT" not in st.secrets or not st.secrets["SALT"]:
     st.stop()
 
 SALT = st.secrets["SALT"]
+# SHA-256 state with the salt already absorbed; hash_id copies it per value
+SALT_HASH = hashlib.sha256(SALT.encode("utf-8"))
 inject_css()
 
 # ---------------------------
@@ -254,78 +258,123 @@ def normalize_email(x):
     return str(x).strip().lower()
 
 def hash_id(value: str) -> str:
-    v = (SALT + value).encode("utf-8")
-    return hashlib.sha256(v).hexdigest()[:16]
-
-def org_to_sector(org_text: str) -> str:
-    if not isinstance(org_text, str) or org_text.strip() == "":
-        return "Other/Unclassified"
-    x = org_text.lower()
-    if any(k in x for k in ["universit", "school", "educat"]):
-        return "Education"
-    if any(k in x for k in ["ngo", "foundation", "association", "civil", "non profit", "non-profit"]):
-        return "NGO/CSO"
-    if any(k in x for k in ["ministry", "gov", "municipal", "department of", "bureau"]):
-        return "Government"
-    if any(k in x for k in ["united nations", "world bank", "fao", "ifad", "ifpri", "undp", "unesco"]):
-        return "Multilateral"
-    if any(k in x for k in ["ltd", "company", "bv", "inc", "plc", "gmbh", "sarl"]):
-        return "Private"
-    if any(k in x for k in ["farmer", "coop", "co-op", "cooperative"]):
-        return "Farmer Org"
-    if any(k in x for k in ["consult"]):
-        return "Consultancy"
-    if any(k in x for k in ["bank", "finance", "microfinance"]):
-        return "Finance"
-    return "Other/Unclassified"
-
-def rubric_heuristic_score(text: str, min_words: int):
-    if not isinstance(text, str) or text.strip() == "":
-        return (0, 0, 0)
-    t = text.strip()
-    words = len(t.split())
-    if words < min_words:
-        return (0, 0, 0)
-
-    has_data = any(w in t.lower() for w in ["data", "dataset", "dashboard", "faostat", "survey"])
-    has_numbers = bool(re.search(r"\b\d+\b", t))
-    has_fs = any(w in t.lower() for w in ["food system", "seed", "agric", "market", "value chain"])
-
-    spec = 10 if (words >= 200 or has_data) else 5
-    feas = 10 if has_numbers else 5
-    rel = 10 if has_fs else 5
-    return (spec, feas, rel)
-
-def label_band(val, admit_thr, priority_thr, sector, equity_reserve, equity_range):
-    if val >= priority_thr:
-        return "Priority"
-    if val >= admit_thr:
-        return "Admit"
-    if equity_reserve and sector == "Farmer Org" and equity_range[0] <= val <= equity_range[1]:
-        return "Reserve (Equity)"
-    return "Reserve"
-
-def normalize_mapping_value(v):
-    if not isinstance(v, str):
-        return ""
-    return v.strip().lower().replace("–", "-").replace("—", "-").replace("≥", ">=").replace(" ", "")
-
-def get_time_points(x):
-    if ">=3h" in x:
-        return 10
-    if "2-3h" in x:
-        return 6
-    if "1-2h" in x:
-        return 3
-    return 0
-
-def yes_no_points(x, cap):
-    if pd.isna(x):
-        return 0
-    text = str(x).strip().lower()
-    if any(text.startswith(p) for p in ["no", "none", "n/a", "0"]):
-        return 0
-    return cap
+    h = SALT_HASH.copy()
+    h.update(value.encode("utf-8"))
+    return h.hexdigest()[:16]
+
+def hash_ids(values: pd.Series) -> pd.Series:
+    """hash_id per row, hashing each distinct value only once."""
+    digests = {v: hash_id(v) for v in values.unique()}
+    return values.map(digests)
+
+def _keyword_pattern(keywords) -> str:
+    return "|".join(re.escape(k) for k in keywords)
+
+# Keyword groups as regex alternations, built once and scanned column-wise
+MOT_DATA_PATTERN = _keyword_pattern(["data", "dataset", "dashboard", "faostat", "survey"])
+MOT_NUMBER_PATTERN = r"\b\d+\b"
+MOT_FS_PATTERN = _keyword_pattern(["food system", "seed", "agric", "market", "value chain"])
+FUNC_DIRECT_PATTERN = _keyword_pattern(["specialist", "officer", "advisor", "director", "manager", "analyst", "lecturer"])
+NO_ANSWER_PATTERN = _keyword_pattern(["no", "none", "n/a", "0"])
+TIME_TIERS = [
+    (_keyword_pattern([">=3", "3+", "3 h", "3h", "more than 3", "at least 3"]), 10.0),
+    (_keyword_pattern(["2-3", "2 to 3", "2.5", "2 h", "2h"]), 6.0),
+    (_keyword_pattern(["1-2", "1 to 2", "1.5", "1 h", "1h"]), 3.0),
+]
+LANG_TIERS = [
+    (_keyword_pattern(["fluent", "native", "advanced", "excellent"]), 1.0),
+    (_keyword_pattern(["working", "intermediate", "good", "professional"]), 0.6),
+    (_keyword_pattern(["basic", "limited", "beginner"]), 0.3),
+]
+
+def _text_series(values: pd.Series) -> pd.Series:
+    """
+    Stripped text per row; non-string cells (NaN, numbers) become empty strings.
+    Kept as Python str objects so .str regexes and lowercasing follow Python's
+    Unicode rules rather than RE2/Arrow on pandas' default str dtype.
+    """
+    if not (pd.api.types.is_object_dtype(values) or pd.api.types.is_string_dtype(values)):
+        return pd.Series("", index=values.index, dtype=object)
+    return values.astype(object).str.strip().fillna("")
+
+# Sector keyword groups in priority order: the first matching sector wins
+SECTOR_PATTERNS = [
+    ("Education", _keyword_pattern(["universit", "school", "educat"])),
+    ("NGO/CSO", _keyword_pattern(["ngo", "foundation", "association", "civil", "non profit", "non-profit"])),
+    ("Government", _keyword_pattern(["ministry", "gov", "municipal", "department of", "bureau"])),
+    ("Multilateral", _keyword_pattern(["united nations", "world bank", "fao", "ifad", "ifpri", "undp", "unesco"])),
+    ("Private", _keyword_pattern(["ltd", "company", "bv", "inc", "plc", "gmbh", "sarl"])),
+    ("Farmer Org", _keyword_pattern(["farmer", "coop", "co-op", "cooperative"])),
+    ("Consultancy", _keyword_pattern(["consult"])),
+    ("Finance", _keyword_pattern(["bank", "finance", "microfinance"])),
+]
+
+def orgs_to_sectors(org_texts: pd.Series) -> pd.Series:
+    """Sector per organisation, one regex scan per sector and np.select for priority."""
+    tl = _text_series(org_texts).str.lower()
+    matches = [tl.str.contains(pattern, regex=True).to_numpy(dtype=bool) for _, pattern in SECTOR_PATTERNS]
+    labels = [sector for sector, _ in SECTOR_PATTERNS]
+    return pd.Series(np.select(matches, labels, default="Other/Unclassified"), index=org_texts.index)
+
+def rubric_heuristic_scores(texts: pd.Series, min_words: int) -> pd.DataFrame:
+    """Specificity / feasibility / relevance for the whole motivation column at once."""
+    t = _text_series(texts)
+    words = t.str.split().str.len().fillna(0).to_numpy()
+    tl = t.str.lower()
+
+    has_data = tl.str.contains(MOT_DATA_PATTERN, regex=True).to_numpy(dtype=bool)
+    has_numbers = t.str.contains(MOT_NUMBER_PATTERN, regex=True).to_numpy(dtype=bool)
+    has_fs = tl.str.contains(MOT_FS_PATTERN, regex=True).to_numpy(dtype=bool)
+
+    # Empty text and motivations under the minimum word count score nothing
+    eligible = (words > 0) & (words >= min_words)
+    return pd.DataFrame({
+        "spec": np.where(eligible, np.where((words >= 200) | has_data, 10, 5), 0),
+        "feas": np.where(eligible, np.where(has_numbers, 10, 5), 0),
+        "rel": np.where(eligible, np.where(has_fs, 10, 5), 0),
+    }, index=texts.index)
+
+def function_points(titles: pd.Series, cap: float) -> np.ndarray:
+    """Full points for direct roles, 40% for any other non-empty title."""
+    xl = titles.where(titles.notna(), "").astype(str).astype(object).str.lower()
+    direct = xl.str.contains(FUNC_DIRECT_PATTERN, regex=True).to_numpy(dtype=bool)
+    return np.select([(xl == "").to_numpy(), direct], [0.0, cap], default=cap * 0.4)
+
+def language_points(values: pd.Series, cap: float) -> np.ndarray:
+    """Points for the first matching language tier (fluent > working > basic), else 0."""
+    t = values.where(values.notna(), "").astype(str).astype(object).str.lower()
+    tiers = [t.str.contains(pattern, regex=True).to_numpy(dtype=bool) for pattern, _ in LANG_TIERS]
+    return np.select(tiers, [cap * factor for _, factor in LANG_TIERS], default=0.0)
+
+def time_points(values: pd.Series) -> np.ndarray:
+    """Points for the first matching weekly-time tier; under 1h or unrecognised scores 0."""
+    t = (
+        values.where(values.notna(), "").astype(str).astype(object).str.lower()
+        .str.replace("–", "-", regex=False)
+        .str.replace("—", "-", regex=False)
+    )
+    tiers = [t.str.contains(pattern, regex=True).to_numpy(dtype=bool) for pattern, _ in TIME_TIERS]
+    return np.select(tiers, [points for _, points in TIME_TIERS], default=0.0)
+
+def label_bands(rfs: pd.Series, sectors: pd.Series, admit_thr, priority_thr, equity_reserve, equity_range) -> np.ndarray:
+    """Decision label per row; np.select keeps the first matching band, like an if-chain."""
+    val = rfs.to_numpy()
+    is_equity = (
+        bool(equity_reserve)
+        & (sectors.to_numpy() == "Farmer Org")
+        & (val >= equity_range[0]) & (val <= equity_range[1])
+    )
+    return np.select(
+        [val >= priority_thr, val >= admit_thr, is_equity],
+        ["Priority", "Admit", "Reserve (Equity)"],
+        default="Reserve",
+    )
+
+def yes_no_points(values: pd.Series, cap) -> np.ndarray:
+    """Full points unless the answer is missing or starts with a no-style prefix."""
+    text = values.where(values.notna(), "").astype(str).astype(object).str.strip().str.lower()
+    is_no = text.str.match(NO_ANSWER_PATTERN).to_numpy(dtype=bool)
+    return np.where(values.notna().to_numpy() & ~is_no, cap, 0)
 
 # ---------------------------
 # Sidebar & Main App
@@ -366,18 +415,22 @@ st.markdown(f"""
 </div>
 """, unsafe_allow_html=True)
 
-uploaded = st.file_uploader("Upload applications file", type=["csv", "xlsx"])
-if uploaded:
+@st.cache_data(show_spinner="Parsing upload…")
+def load_table(raw_bytes: bytes, name: str) -> pd.DataFrame:
+    """Parse the upload and tidy its headers; cached so reruns don't re-read the same file."""
     # ---- Robust read ----
-    name = uploaded.name.lower()
     if name.endswith(".xlsx"):
-        df = pd.read_excel(uploaded, engine="openpyxl")
+        df = pd.read_excel(io.BytesIO(raw_bytes), engine="openpyxl")
     else:
-        df = pd.read_csv(uploaded, encoding_errors="ignore")
+        df = pd.read_csv(io.BytesIO(raw_bytes), encoding_errors="ignore")
 
     # ---- Clean column names (prevents silly KeyErrors) ----
     df.columns = [re.sub(r"\s+", " ", str(c)).strip() for c in df.columns]
-    df = df.loc[:, ~df.columns.duplicated()]  # keep first if duplicate headers
+    return df.loc[:, ~df.columns.duplicated()]  # keep first if duplicate headers
+
+uploaded = st.file_uploader("Upload applications file", type=["csv", "xlsx"])
+if uploaded:
+    df = load_table(uploaded.getvalue(), uploaded.name.lower())
 
     # ---- Column detection + mapping UI ----
     def _find_cols(patterns):
@@ -416,47 +469,18 @@ if uploaded:
         time_col  = pick_column("Weekly time commitment", [r"time", r"hours", r"weekly", r"commit"], required=False)
         alm_col   = pick_column("Alumni referral", [r"alumni", r"referral", r"referred", r"how.*hear"], required=False)
 
-    # ---- More tolerant parsers ----
-    def language_points(x):
-        if pd.isna(x):
-            return 0.0
-        t = str(x).strip().lower()
-        if any(k in t for k in ["fluent", "native", "advanced", "excellent"]):
-            return float(preset["w_lang"])
-        if any(k in t for k in ["working", "intermediate", "good", "professional"]):
-            return float(preset["w_lang"]) * 0.6
-        if any(k in t for k in ["basic", "limited", "beginner"]):
-            return float(preset["w_lang"]) * 0.3
-        return 0.0
-
-    def time_points(x):
-        if pd.isna(x):
-            return 0.0
-        t = str(x).strip().lower().replace("–", "-").replace("—", "-")
-        if any(k in t for k in [">=3", "3+", "3 h", "3h", "more than 3", "at least 3"]):
-            return 10.0
-        if any(k in t for k in ["2-3", "2 to 3", "2.5", "2 h", "2h"]):
-            return 6.0
-        if any(k in t for k in ["1-2", "1 to 2", "1.5", "1 h", "1h"]):
-            return 3.0
-        if any(k in t for k in ["<1", "less than 1", "0.5", "30 min"]):
-            return 0.0
-        return 0.0
-
-    def safe_text(x):
-        return "" if pd.isna(x) else str(x)
-
     # ---- Build working frame ----
-    work = df.copy()
-    work["Email_Norm"] = work[email_col].apply(normalize_email)
+    email_norm = df[email_col].apply(normalize_email)
 
-    # Drop empty emails (otherwise everyone hashes to same PID)
-    work = work[work["Email_Norm"] != ""].copy()
+    # Drop empty emails (otherwise everyone hashes to same PID). Filtering df first
+    # means later steps only work on (and copy) the kept rows.
+    has_email = email_norm != ""
+    work = df[has_email].assign(Email_Norm=email_norm[has_email])
     if work.empty:
         st.error("No valid email values found after normalization. Check your Email column mapping.")
         st.stop()
 
-    work.insert(0, "PID", work["Email_Norm"].apply(hash_id))
+    work.insert(0, "PID", hash_ids(work["Email_Norm"]))
 
     # ---- Optional: de-duplicate repeated applicants by email ----
     ts_hits = _find_cols([r"timestamp", r"submitted", r"submission", r"date"])
@@ -473,47 +497,42 @@ if uploaded:
 
     # ---- 1) Motivation ----
     if mot_col:
-        mot_scores = work[mot_col].apply(lambda x: rubric_heuristic_score(safe_text(x), preset["min_motivation_words"]))
-        work["MotivationPts"] = (mot_scores.apply(sum) / 30.0) * preset["w_motivation"]
+        mot_scores = rubric_heuristic_scores(work[mot_col], preset["min_motivation_words"])
+        work["MotivationPts"] = (mot_scores.sum(axis=1) / 30.0) * preset["w_motivation"]
     else:
         work["MotivationPts"] = 0.0
 
     # ---- 2) Function ----
-    def function_points(x):
-        xl = safe_text(x).lower()
-        if xl == "":
-            return 0.0
-        direct = any(k in xl for k in ["specialist", "officer", "advisor", "director", "manager", "analyst", "lecturer"])
-        return float(preset["w_function"]) if direct else float(preset["w_function"]) * 0.4
-
-    work["FunctionPts"] = work[func_col].apply(function_points)
+    work["FunctionPts"] = function_points(work[func_col], float(preset["w_function"]))
 
     # ---- 3) Referee / Sector / Language / Time ----
-    work["RefereePts"] = work[ref_col].apply(lambda x: yes_no_points(x, preset["w_referee"])) if ref_col else 0.0
+    work["RefereePts"] = yes_no_points(work[ref_col], preset["w_referee"]) if ref_col else 0.0
 
     if org_col:
-        work["Sector"] = work[org_col].apply(org_to_sector)
+        work["Sector"] = orgs_to_sectors(work[org_col])
     else:
         work["Sector"] = "Other/Unclassified"
 
-    work["SectorPts"] = work["Sector"].map(lambda s: preset["sector_uplift"].get(s, 0))
+    # Few distinct sectors: store as codes and gather the uplift per code
+    # (trailing 0 covers code -1, i.e. a missing sector)
+    work["Sector"] = work["Sector"].astype("category")
+    sectors = work["Sector"].cat
+    uplift = np.array([preset["sector_uplift"].get(c, 0) for c in sectors.categories] + [0])
+    work["SectorPts"] = uplift[sectors.codes.to_numpy()]
 
-    work["LanguagePts"] = work[lang_col].apply(language_points) if lang_col else 0.0
-    work["TimePts"]     = work[time_col].apply(time_points) if time_col else 0.0
+    work["LanguagePts"] = language_points(work[lang_col], float(preset["w_lang"])) if lang_col else 0.0
+    work["TimePts"]     = time_points(work[time_col]) if time_col else 0.0
 
     # ---- 4) Final scoring ----
     pts_cols = ["MotivationPts", "FunctionPts", "RefereePts", "SectorPts", "LanguagePts", "TimePts"]
     work["RFS"] = work[pts_cols].sum(axis=1).round(2)
-    work["predicted Decision"] = work.apply(
-        lambda r: label_band(
-            r["RFS"],
-            preset["thresh_admit"],
-            preset["thresh_priority"],
-            r["Sector"],
-            True,
-            (preset["equity_lower"], preset["equity_upper"])
-        ),
-        axis=1
+    work["predicted Decision"] = label_bands(
+        work["RFS"],
+        work["Sector"],
+        preset["thresh_admit"],
+        preset["thresh_priority"],
+        True,
+        (preset["equity_lower"], preset["equity_upper"])
     )
 
     st.success(f"✅ Scored {len(work)} applicants using **{preset['name']}** model")
@@ -0,0 +1,28 @@
+"""The Summary tab's sector-by-decision table must read back through AppTest."""
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("streamlit")
+from streamlit.testing.v1 import AppTest
+
+REPO = Path(__file__).resolve().parent.parent
+
+
+def test_app_sector_pivot_reads_back():
+    motivation = "we will cover 3 districts " + " ".join(["word"] * 60)
+    csv_bytes = (
+        "Email,Organisation,MotivationText,WeeklyTimeBand\n"
+        f'a@x.org,Ministry of Agriculture,"{motivation}",>=3h\n'
+        "b@x.org,Acme Ltd,,<1h\n"
+    ).encode("utf-8")
+    at = AppTest.from_file(str(REPO / "app.py"), default_timeout=120)
+    at.secrets["SALT"] = "test-salt"
+    at.run()
+    at.file_uploader[0].set_value(("upload.csv", csv_bytes, "text/csv")).run()
+    assert not at.exception, [e.value for e in at.exception]
+
+    # Scores table first, then the sector pivot on the Summary tab
+    pivot = at.dataframe[1].value
+    assert int(pivot.to_numpy().sum()) == 2
+    assert set(pivot.columns) <= {"Priority", "Admit", "Reserve (Equity)", "Reserve"}
@@ -0,0 +1,68 @@
+"""
+Regression tests for non-ASCII text in uploads.
+
+The scoring helpers run column-wise, and pandas' default Arrow-backed str dtype
+matches regexes with RE2 and lowercases with Arrow kernels. Those follow ASCII
+rules for \\d, \\b and \\s and differ from Python on some case mappings. These
+end-to-end runs pin the scores the per-row Python implementation produced.
+"""
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("streamlit")
+from streamlit.testing.v1 import AppTest
+
+REPO = Path(__file__).resolve().parent.parent
+FILLER = " ".join(["word"] * 60)
+
+
+def _csv(header, rows):
+    lines = [",".join(header)] + [",".join(f'"{v}"' for v in row) for row in rows]
+    return "\n".join(lines).encode("utf-8")
+
+
+def _scores(app_file, csv_bytes):
+    at = AppTest.from_file(str(REPO / app_file), default_timeout=120)
+    at.secrets["SALT"] = "test-salt"
+    at.run()
+    at.file_uploader[0].set_value(("upload.csv", csv_bytes, "text/csv")).run()
+    assert not at.exception, [e.value for e in at.exception]
+    return at.dataframe[0].value.reset_index(drop=True)
+
+
+def test_app_unicode_text_scores_match_python_semantics():
+    rows = [
+        # "2ème" is not a standalone number under Python's Unicode \b
+        ["a@x.org", "Acme Ltd", f"Je suis en 2ème année {FILLER}", "<1h"],
+        # Arabic-Indic digits are digits under Python's Unicode \d
+        ["b@x.org", "Acme Ltd", f"we will cover ٣ districts {FILLER}", "<1h"],
+        ["c@x.org", "Acme Ltd", f"we will cover 3 districts {FILLER}", "<1h"],
+        # ordinal suffix: no standalone number either way
+        ["d@x.org", "Acme Ltd", f"my 3rd year {FILLER}", "<1h"],
+        # NBSP between number and unit (Excel / French locale exports)
+        ["e@x.org", "Acme Ltd", FILLER, "1–2\u00a0h"],
+        ["f@x.org", "Acme Ltd", FILLER, "2\u202f-\u202f3\u00a0h"],
+        # Python lowercases İ to "i̇", so this is not a "ministry" match
+        ["g@x.org", "MİNİSTRY OF AGRICULTURE", FILLER, "<1h"],
+    ]
+    csv_bytes = _csv(["Email", "Organisation", "MotivationText", "WeeklyTimeBand"], rows)
+    scores = _scores("app.py", csv_bytes)
+
+    assert scores["MotivationPts"].round(2).tolist() == [0.0, 9.0, 9.0, 0.0, 0.0, 0.0, 0.0]
+    assert scores["TimePts"].tolist() == [0, 0, 0, 0, 3, 6, 0]
+    assert scores["Sector"].astype(str).tolist() == ["Private"] * 6 + ["Other/Unclassified"]
+
+
+def test_apptest_unicode_text_scores_match_python_semantics():
+    rows = [
+        ["a@x.org", f"Je suis en 2ème année {FILLER}", "Officer", "LİMİTED ENGLİSH"],
+        ["b@x.org", f"we will cover ٣ districts {FILLER}", "Officer", "Fluent"],
+        ["c@x.org", f"we will cover 3 districts {FILLER}", "Officer", "Fluent"],
+        ["d@x.org", f"my 3rd year {FILLER}", "Officer", "Fluent"],
+    ]
+    csv_bytes = _csv(["Email", "Motivation", "Function", "Language"], rows)
+    scores = _scores("apptest.py", csv_bytes)
+
+    assert scores["MotivationPts"].round(2).tolist() == [7.5, 10.0, 10.0, 7.5]
+    assert scores["LanguagePts"].tolist() == [0.0, 15.0, 15.0, 15.0]